@@ -1,5 +1,11 @@
 import logging
 import os
+import re
+
+from typing import Callable, Optional
+
+
+REGEXP_META_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
 
 
 _logger = None
@@ -31,3 +37,34 @@ def get_default_config_dir():
         logger().info("Creating dir: %s" % config_dir)
         os.makedirs(config_dir)
     return config_dir
+
+
+def compile_matcher(regexp: Optional[str]) -> Optional[Callable[[str], bool]]:
+    """
+    Turns the regular expression into a function that checks whether a string
+    matches it (same semantics as re.match). Plain strings get checked via
+    str.startswith and the literal prefix of a regexp is used as pre-filter.
+
+    :param regexp: the regular expression to use, can be None
+    :type regexp: str
+    :return: the matching function, None if no regexp supplied
+    """
+    if regexp is None:
+        return None
+
+    meta = REGEXP_META_CHARS.search(regexp)
+    if meta is None:
+        return lambda s: s.startswith(regexp)
+
+    pattern = re.compile(regexp)
+    if "|" in regexp:
+        prefix = ""
+    else:
+        prefix = regexp[:meta.start()]
+        # quantifier makes the preceding character optional
+        if regexp[meta.start()] in "*?{":
+            prefix = prefix[:-1]
+    if len(prefix) > 0:
+        return lambda s: s.startswith(prefix) and (pattern.match(s) is not None)
+    else:
+        return lambda s: pattern.match(s) is not None
@@ -30,12 +30,13 @@ EVENT_FIELDS = [
     EVENT_ICALUID,
 ]
 
+# ordered by how likely the fields change, to exit comparison early
 EVENT_COMPARISON_FIELDS = [
-    EVENT_SUMMARY,
-    EVENT_DESCRIPTION,
-    EVENT_LOCATION,
     EVENT_START,
     EVENT_END,
+    EVENT_SUMMARY,
+    EVENT_LOCATION,
+    EVENT_DESCRIPTION,
     EVENT_UPDATED,
 ]
 
@@ -56,6 +57,129 @@ def logger() -> logging.Logger:
     return _logger
 
 
+def _ical_date(event, key: str) -> Optional[Union[datetime, date]]:
+    """
+    Returns the date/datetime of the iCal event property.
+
+    :param event: the iCal event to get the value from
+    :param key: the name of the property
+    :type key: str
+    :return: the date/datetime, None if not present
+    """
+    if key in event:
+        return event[key].dt
+    else:
+        return None
+
+
+def _parse_google_date(event, key: str) -> Optional[Union[datetime, date]]:
+    """
+    Parses the date/datetime of the Google event start/end field.
+
+    :param event: the Google event to get the value from
+    :param key: the name of the field
+    :type key: str
+    :return: the date/datetime, None if not present
+    """
+    if key in event:
+        d = event[key]
+        if "dateTime" in d:
+            return datetime.fromisoformat(d["dateTime"])
+        else:
+            return date.fromisoformat(d["date"])
+    else:
+        return None
+
+
+def _parse_google_updated(event) -> Optional[datetime]:
+    """
+    Parses the last updated timestamp of the Google event.
+
+    :param event: the Google event to get the value from
+    :return: the timestamp, None if not present
+    """
+    if "updated" in event:
+        return datetime.fromisoformat(event["updated"].replace("Z", "+00:00"))
+    else:
+        return None
+
+
+class GoogleEvent(dict):
+    """
+    Google Calendar event as returned by the API, with the start/end/updated
+    timestamps parsed once when wrapping the event. The parsed values are
+    stored as attributes and not as part of the event dictionary.
+    """
+
+    def __init__(self, event):
+        """
+        Initializes the wrapper with the event.
+
+        :param event: the Google event dictionary to wrap
+        :type event: dict
+        """
+        super().__init__(event)
+        self.start = _parse_google_date(self, "start")
+        self.end = _parse_google_date(self, "end")
+        self.updated = _parse_google_updated(self)
+
+
+def _google_date(event, key: str) -> Optional[Union[datetime, date]]:
+    """
+    Returns the date/datetime of the Google event start/end field.
+
+    :param event: the Google event to get the value from
+    :param key: the name of the field
+    :type key: str
+    :return: the date/datetime, None if not present
+    """
+    if isinstance(event, GoogleEvent):
+        return getattr(event, key)
+    else:
+        return _parse_google_date(event, key)
+
+
+def _google_updated(event) -> Optional[datetime]:
+    """
+    Returns the last updated timestamp of the Google event.
+
+    :param event: the Google event to get the value from
+    :return: the timestamp, None if not present
+    """
+    if isinstance(event, GoogleEvent):
+        return event.updated
+    else:
+        return _parse_google_updated(event)
+
+
+# text values are returned as plain str rather than icalendar's vText
+ICAL_GETTERS = {
+    EVENT_ID: lambda e: str(e["UID"]),
+    EVENT_ICALUID: lambda e: str(e["UID"]),
+    EVENT_SUMMARY: lambda e: str(e.get("SUMMARY", "")),
+    EVENT_DESCRIPTION: lambda e: str(e.get("DESCRIPTION", "")),
+    EVENT_STATUS: lambda e: str(e["STATUS"]),
+    EVENT_LOCATION: lambda e: str(e.get("LOCATION", "")),
+    EVENT_RECURRENCE: lambda e: e.get("RRULE"),
+    EVENT_START: lambda e: _ical_date(e, "DTSTART"),
+    EVENT_END: lambda e: _ical_date(e, "DTEND"),
+    EVENT_UPDATED: lambda e: _ical_date(e, "DTSTAMP"),
+}
+
+GOOGLE_GETTERS = {
+    EVENT_ID: lambda e: e["id"],
+    EVENT_ICALUID: lambda e: e.get("iCalUID"),
+    EVENT_SUMMARY: lambda e: e.get("summary", ""),
+    EVENT_DESCRIPTION: lambda e: e.get("description", ""),
+    EVENT_STATUS: lambda e: e["status"],
+    EVENT_LOCATION: lambda e: e.get("location", ""),
+    EVENT_RECURRENCE: lambda e: e.get("recurrence"),
+    EVENT_START: lambda e: _google_date(e, "start"),
+    EVENT_END: lambda e: _google_date(e, "end"),
+    EVENT_UPDATED: _google_updated,
+}
+
+
 def event_field(event, field: str) -> Optional[Union[str, object, datetime, date]]:
     """
     Returns the specified event value.
@@ -65,79 +189,12 @@ def event_field(event, field: str) -> Optional[Union[str, object, datetime, date
     :type field: str
     :return: the value, can be None; summary/description is empty string when missing; start/end are returned as datetime objects
     """
-    if field not in EVENT_FIELDS:
+    getters = ICAL_GETTERS if isinstance(event, icalendar.Event) else GOOGLE_GETTERS
+    try:
+        getter = getters[field]
+    except KeyError:
         raise Exception("Unknown event field: %s" % field)
-
-    if isinstance(event, icalendar.Event):
-        if (field == EVENT_ID) or (field == EVENT_ICALUID):
-            return event["UID"]
-        elif field == EVENT_SUMMARY:
-            return event.get("SUMMARY", "")
-        elif field == EVENT_DESCRIPTION:
-            return event.get("DESCRIPTION", "")
-        elif field == EVENT_STATUS:
-            return event["STATUS"]
-        elif field == EVENT_LOCATION:
-            return event.get("LOCATION", "")
-        elif field == EVENT_RECURRENCE:
-            return event.get("RRULE")
-        elif field == EVENT_START:
-            if "DTSTART" in event:
-                return event["DTSTART"].dt
-            else:
-                return None
-        elif field == EVENT_END:
-            if "DTEND" in event:
-                return event["DTEND"].dt
-            else:
-                return None
-        elif field == EVENT_UPDATED:
-            if "DTSTAMP" in event:
-                return event["DTSTAMP"].dt
-            else:
-                return None
-        else:
-            raise Exception("Unhandled event field: %s" % field)
-    else:
-        if field == EVENT_ID:
-            return event["id"]
-        elif field == EVENT_ICALUID:
-            return event.get("iCalUID")
-        elif field == EVENT_SUMMARY:
-            return event.get("summary", "")
-        elif field == EVENT_DESCRIPTION:
-            return event.get("description", "")
-        elif field == EVENT_STATUS:
-            return event["status"]
-        elif field == EVENT_LOCATION:
-            return event.get("location", "")
-        elif field == EVENT_RECURRENCE:
-            return event.get("recurrence")
-        elif field == EVENT_START:
-            if "start" in event:
-                d = event["start"]
-                if "dateTime" in d:
-                    return datetime.fromisoformat(d["dateTime"])
-                else:
-                    return datetime.strptime(d["date"], "%Y-%m-%d").date()
-            else:
-                return None
-        elif field == EVENT_END:
-            if "end" in event:
-                d = event["end"]
-                if "dateTime" in d:
-                    return datetime.fromisoformat(d["dateTime"])
-                else:
-                    return datetime.strptime(d["date"], "%Y-%m-%d").date()
-            else:
-                return None
-        elif field == EVENT_UPDATED:
-            if "updated" in event:
-                return datetime.fromisoformat(event["updated"].replace("Z", "+00:00"))
-            else:
-                return None
-        else:
-            raise Exception("Unhandled event field: %s" % field)
+    return getter(event)
 
 
 def is_same_event(outlook, google) -> bool:
@@ -149,14 +206,14 @@ def is_same_event(outlook, google) -> bool:
     :return: True if they represent the same event
     :rtype: bool
     """
-    oid = event_field(outlook, EVENT_ID)
-    gid = google["iCalUID"] if ("iCalUID" in google) else ""
+    oid = ICAL_GETTERS[EVENT_ID](outlook)
+    gid = google.get("iCalUID", "")
     return oid == gid
 
 
 def has_event_changed(outlook, google) -> bool:
     """
-    Checks whether at least one field differ sbetween the corresponding Outlook/Google events.
+    Checks whether at least one field differs between the corresponding Outlook/Google events.
 
     :param outlook: the Outlook event
     :param google: the Google Calendar event
@@ -164,10 +221,12 @@ def has_event_changed(outlook, google) -> bool:
     :rtype: bool
     """
     result = False
+    ogetters = ICAL_GETTERS if isinstance(outlook, icalendar.Event) else GOOGLE_GETTERS
+    ggetters = ICAL_GETTERS if isinstance(google, icalendar.Event) else GOOGLE_GETTERS
 
     for field in EVENT_COMPARISON_FIELDS:
-        ovalue = event_field(outlook, field)
-        gvalue = event_field(google, field)
+        ovalue = ogetters[field](outlook)
+        gvalue = ggetters[field](google)
         if field == EVENT_UPDATED:
             # only flag as changed if Outlook is newer
             if gvalue < ovalue:
@@ -3,17 +3,18 @@
 
 import logging
 import os
-import re
 
 from datetime import datetime
 from typing import Optional
 
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from itg.api.core import get_default_config_dir
+from itg.api.core import get_default_config_dir, compile_matcher
+from itg.api.events import GoogleEvent
 
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
@@ -112,6 +113,22 @@ def init_service(credentials: str):
         return None
 
 
+def is_auth_error(error: Exception) -> bool:
+    """
+    Checks whether the exception represents an authentication/authorization problem.
+
+    :param error: the exception to check
+    :type error: Exception
+    :return: True if an authentication error
+    :rtype: bool
+    """
+    if isinstance(error, RefreshError):
+        return True
+    if isinstance(error, HttpError):
+        return error.resp.status == 401
+    return False
+
+
 def filter_events(service, calendar: str, regexp_id: str = None, regexp_summary: str = None):
     """
     Filters the events from Google calendar.
@@ -123,7 +140,8 @@ def filter_events(service, calendar: str, regexp_id: str = None, regexp_summary:
     :type regexp_id: str
     :param regexp_summary: the regular expression that the event summaries must match, ignored if None
     :type regexp_summary: str
-    :return:
+    :return: the list of events (as GoogleEvent)
+    :rtype: list
     """
     result = []
 
@@ -143,18 +161,19 @@ def filter_events(service, calendar: str, regexp_id: str = None, regexp_summary:
         ).execute()
     )
 
+    match_id = compile_matcher(regexp_id)
+    match_summary = compile_matcher(regexp_summary)
+
     for event in events["items"]:
         if event["status"].lower() == "cancelled":
             continue
-        if regexp_id is not None:
-            match = re.match(regexp_id, event["id"])
-            if not match:
+        if match_id is not None:
+            if not match_id(event["id"]):
                 continue
         if "summary" in event:
-            if regexp_summary is not None:
-                match = re.match(regexp_summary, event["summary"])
-                if not match:
+            if match_summary is not None:
+                if not match_summary(event["summary"]):
                     continue
-        result.append(event)
+        result.append(GoogleEvent(event))
 
     return result
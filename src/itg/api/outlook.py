@@ -1,16 +1,39 @@
+import hashlib
+import io
 import logging
 import os
-import re
 import shutil
 
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 import icalendar
 import requests
 
+from itg.api.core import compile_matcher
+
+
+PARSE_CACHE_SIZE = 4
+
+DOWNLOAD_CHUNK_SIZE = 65536
+
 
 _logger = None
 
+_session = None
+
+_writer = None
+
+# path -> (mtime, size, calendar), in least recently used order
+_parse_cache = OrderedDict()
+
+# url -> (etag, last-modified, calendar)
+_url_cache = dict()
+
+# path/url -> SHA-256 digest of the raw calendar data last loaded
+_digests = dict()
+
 
 def logger() -> logging.Logger:
     """
@@ -25,6 +48,55 @@ def logger() -> logging.Logger:
     return _logger
 
 
+def session() -> requests.Session:
+    """
+    Return the HTTP session to use, re-using connections across calls.
+
+    :return: the session
+    :rtype: requests.Session
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def writer() -> ThreadPoolExecutor:
+    """
+    Return the executor for saving calendars in the background.
+
+    :return: the executor
+    :rtype: ThreadPoolExecutor
+    """
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1)
+    return _writer
+
+
+def save_calendar(data: bytes, output_file: str):
+    """
+    Saves the raw calendar data to the specified file. The data gets written to a
+    temporary file first, which then replaces the output file, so that a failed
+    write does not destroy a previously saved calendar.
+
+    :param data: the calendar data to save
+    :type data: bytes
+    :param output_file: the file to save the calendar to
+    :type output_file: str
+    """
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(tmp_file, "wb") as fp:
+            fp.write(data)
+            fp.write(b"\n")
+        os.replace(tmp_file, output_file)
+    except:
+        logger().error("Failed to save Outlook calendar to: %s" % output_file)
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
 def load_calendar_from_url(url: str, output_file: str = None) -> icalendar.Calendar:
     """
     Loads a calendar from a URL.
@@ -37,19 +109,34 @@ def load_calendar_from_url(url: str, output_file: str = None) -> icalendar.Calen
     :rtype: icalendar.Calendar
     """
     logger().info("Downloading calendar: %s" % url)
-    r = requests.get(url)
-    if r.status_code == 200:
-        result = icalendar.Calendar.from_ical(r.text)
-        if output_file is not None:
-            try:
-                with open(output_file, "w") as fp:
-                    fp.write(r.text)
-                    fp.write("\n")
-            except:
-                logger().error("Failed to save Outlook calendar to: %s" % output_file)
-        return result
-    else:
-        raise Exception("Failed to retrieve Outlook calendar '%s', status code: %d" % (url, r.status_code))
+    headers = dict()
+    if url in _url_cache:
+        etag, last_modified, _ = _url_cache[url]
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+    with session().get(url, headers=headers, stream=True) as r:
+        if (r.status_code == 304) and (url in _url_cache):
+            logger().info("Calendar not modified: %s" % url)
+            return _url_cache[url][2]
+        elif r.status_code == 200:
+            # read in chunks, as the body can be large
+            buffer = io.BytesIO()
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+            data = buffer.getvalue()
+            _digests[url] = hashlib.sha256(data).digest()
+            result = icalendar.Calendar.from_ical(data)
+            if output_file is not None:
+                writer().submit(save_calendar, data, output_file)
+            if ("ETag" in r.headers) or ("Last-Modified" in r.headers):
+                _url_cache[url] = (r.headers.get("ETag"), r.headers.get("Last-Modified"), result)
+            elif url in _url_cache:
+                del _url_cache[url]
+            return result
+        else:
+            raise Exception("Failed to retrieve Outlook calendar '%s', status code: %d" % (url, r.status_code))
 
 
 def load_calendar_from_path(path: str, output_file: str = None) -> icalendar.Calendar:
@@ -65,14 +152,26 @@ def load_calendar_from_path(path: str, output_file: str = None) -> icalendar.Cal
     """
     logger().info("Loading calendar: %s" % path)
     if os.path.exists(path) and os.path.isfile(path):
-        with open(path) as fp:
-            result = icalendar.Calendar.from_ical(fp.read())
-            if output_file is not None:
-                try:
-                    shutil.copy(path, output_file)
-                except:
-                    logger().error("Failed to copy Outlook calendar to: %s" % output_file)
-            return result
+        st = os.stat(path)
+        if (path in _parse_cache) and (_parse_cache[path][:2] == (st.st_mtime_ns, st.st_size)):
+            logger().info("Calendar not modified: %s" % path)
+            _parse_cache.move_to_end(path)
+            result = _parse_cache[path][2]
+        else:
+            with open(path, "rb") as fp:
+                data = fp.read()
+            _digests[path] = hashlib.sha256(data).digest()
+            result = icalendar.Calendar.from_ical(data)
+            _parse_cache[path] = (st.st_mtime_ns, st.st_size, result)
+            _parse_cache.move_to_end(path)
+            while len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        if output_file is not None:
+            try:
+                shutil.copy(path, output_file)
+            except:
+                logger().error("Failed to copy Outlook calendar to: %s" % output_file)
+        return result
     else:
         raise IOError("Calendar file does not exist: %s" % path)
 
@@ -94,6 +193,19 @@ def load_calendar(path_or_url: str, output_file: str = None) -> icalendar.Calend
         return load_calendar_from_path(path_or_url, output_file=output_file)
 
 
+def calendar_digest(path_or_url: str) -> Optional[bytes]:
+    """
+    Returns the SHA-256 digest of the raw data of the calendar that was last
+    loaded from the path or URL.
+
+    :param path_or_url: the path or URL of the calendar
+    :type path_or_url: str
+    :return: the digest, None if calendar not loaded yet
+    :rtype: bytes
+    """
+    return _digests.get(path_or_url)
+
+
 def filter_events(calendar: icalendar.Calendar, regexp_id: str = None, regexp_summary: str = None) -> List:
     """
     Filters the events.
@@ -107,16 +219,20 @@ def filter_events(calendar: icalendar.Calendar, regexp_id: str = None, regexp_su
     :return: the list of events
     :rtype: list
     """
+    # nothing to filter
+    if (regexp_id is None) and (regexp_summary is None):
+        return calendar.walk('VEVENT')
+
     result = []
+    match_id = compile_matcher(regexp_id)
+    match_summary = compile_matcher(regexp_summary)
 
     for event in calendar.walk('VEVENT'):
-        if regexp_id is not None:
-            match = re.match(regexp_id, event["UID"])
-            if not match:
+        if match_id is not None:
+            if not match_id(str(event["UID"])):
                 continue
-        if regexp_summary is not None:
-            match = re.match(regexp_summary, event["SUMMARY"])
-            if not match:
+        if match_summary is not None:
+            if not match_summary(str(event["SUMMARY"])):
                 continue
         result.append(event)
 
@@ -8,8 +8,8 @@ from typing import List, Dict, Any
 import icalendar
 
 from googleapiclient.errors import HttpError
-from itg.api.events import EVENT_ID, EVENT_SUMMARY, EVENT_DESCRIPTION, EVENT_LOCATION, EVENT_RECURRENCE, EVENT_STATUS, EVENT_START, EVENT_END, EVENT_UPDATED
-from itg.api.events import event_field, is_same_event, has_event_changed
+from itg.api.events import EVENT_ID, EVENT_SUMMARY, EVENT_DESCRIPTION, EVENT_LOCATION, EVENT_RECURRENCE, EVENT_STATUS, EVENT_START, EVENT_END, EVENT_UPDATED, EVENT_ICALUID
+from itg.api.events import event_field, has_event_changed, ICAL_GETTERS, GOOGLE_GETTERS
 
 
 ACTION_ADD = "add"
@@ -21,6 +21,8 @@ ACTIONS = [
     ACTION_UPDATE,
 ]
 
+BATCH_SIZE = 50
+
 
 _logger = None
 
@@ -52,26 +54,32 @@ def compare(ical_events: List, google_events: List) -> Dict[str, List[Any]]:
     """
     result = dict()
 
+    # index events by their iCal UID
+    google_uids = [GOOGLE_GETTERS[EVENT_ICALUID](gevent) or "" for gevent in google_events]
+    google_by_uid = dict()
+    for gid, gevent in zip(google_uids, google_events):
+        if gid not in google_by_uid:
+            google_by_uid[gid] = []
+        google_by_uid[gid].append(gevent)
+    ical_uids = set()
+    ical_id = ICAL_GETTERS[EVENT_ID]
+
     for oevent in ical_events:
-        found = False
-        for gevent in google_events:
-            if is_same_event(oevent, gevent):
-                found = True
+        oid = ical_id(oevent)
+        ical_uids.add(oid)
+        if oid in google_by_uid:
+            for gevent in google_by_uid[oid]:
                 if has_event_changed(oevent, gevent):
                     if ACTION_UPDATE not in result:
                         result[ACTION_UPDATE] = []
                     result[ACTION_UPDATE].append((oevent, gevent))
-        if not found:
+        else:
             if ACTION_ADD not in result:
                 result[ACTION_ADD] = []
             result[ACTION_ADD].append(oevent)
 
-    for gevent in google_events:
-        found = False
-        for oevent in ical_events:
-            if is_same_event(oevent, gevent):
-                found = True
-        if not found:
+    for gid, gevent in zip(google_uids, google_events):
+        if gid not in ical_uids:
             if ACTION_DELETE not in result:
                 result[ACTION_DELETE] = []
             result[ACTION_DELETE].append(gevent)
@@ -79,21 +87,15 @@ def compare(ical_events: List, google_events: List) -> Dict[str, List[Any]]:
     return result
 
 
-def add_event(service, gcalendar: str, oevent, dry_run: bool = False) -> bool:
+def event_body(oevent) -> Dict[str, Any]:
     """
-    Adds the Outlook event in the Google calendar.
+    Generates the Google Calendar request body from the Outlook event.
 
-    :param service: the Google Calendar service instance to use
-    :param gcalendar: the Google Calendar to use
-    :type gcalendar: str
-    :param oevent: the Outlook event to add
+    :param oevent: the Outlook event to convert
     :type oevent: icalendar.Event
-    :param dry_run: whether to perform a dry-run only and not change the Google Calendar at all
-    :type dry_run: bool
-    :return: True if successfully added
-    :rtype: bool
+    :return: the request body
+    :rtype: dict
     """
-    logger().info("adding: %s" % str(oevent))
     body = {
         "summary": event_field(oevent, EVENT_SUMMARY),
         "iCalUID": event_field(oevent, EVENT_ID),
@@ -118,16 +120,53 @@ def add_event(service, gcalendar: str, oevent, dry_run: bool = False) -> bool:
     if event_field(oevent, EVENT_RECURRENCE) is not None:
         body["recurrence"] = ["RRULE:" + event_field(oevent, EVENT_RECURRENCE).to_ical().decode()]
 
+    return body
+
+
+def add_request(service, gcalendar: str, oevent, dry_run: bool = False):
+    """
+    Creates the (unexecuted) request for adding the Outlook event to the Google calendar.
+
+    :param service: the Google Calendar service instance to use
+    :param gcalendar: the Google Calendar to use
+    :type gcalendar: str
+    :param oevent: the Outlook event to add
+    :type oevent: icalendar.Event
+    :param dry_run: whether to perform a dry-run only, i.e., only log the request body
+    :type dry_run: bool
+    :return: the request, None if dry-run
+    """
+    logger().info("adding: %s" % str(oevent))
+    body = event_body(oevent)
     if dry_run:
         logger().info("add body:\n%s" % (json.dumps(body, indent=2)))
+        return None
+    return service.events().insert(
+        calendarId=gcalendar,
+        body=body,
+    )
+
+
+def add_event(service, gcalendar: str, oevent, dry_run: bool = False) -> bool:
+    """
+    Adds the Outlook event in the Google calendar.
+
+    :param service: the Google Calendar service instance to use
+    :param gcalendar: the Google Calendar to use
+    :type gcalendar: str
+    :param oevent: the Outlook event to add
+    :type oevent: icalendar.Event
+    :param dry_run: whether to perform a dry-run only and not change the Google Calendar at all
+    :type dry_run: bool
+    :return: True if successfully added
+    :rtype: bool
+    """
+    request = add_request(service, gcalendar, oevent, dry_run=dry_run)
+    if request is None:
+        return True
     else:
         try:
-            event = (
-                service.events().insert(
-                    calendarId=gcalendar,
-                    body=body,
-                ).execute()
-            )
+            event = request.execute()
             logger().info("event added: %s" % str(event))
             return True
         except HttpError as error:
@@ -135,6 +174,27 @@ def add_event(service, gcalendar: str, oevent, dry_run: bool = False) -> bool:
             return False
 
 
+def delete_request(service, gcalendar: str, gevent, dry_run: bool = False):
+    """
+    Creates the (unexecuted) request for removing the Google event from the Google calendar.
+
+    :param service: the Google Calendar service instance to use
+    :param gcalendar: the Google Calendar to use
+    :type gcalendar: str
+    :param gevent: the Google event to delete
+    :param dry_run: whether to perform a dry-run only, i.e., only log the event
+    :type dry_run: bool
+    :return: the request, None if dry-run
+    """
+    logger().info("deleting: %s" % str(gevent))
+    if dry_run:
+        return None
+    return service.events().delete(
+        calendarId=gcalendar,
+        eventId=gevent["id"],
+    )
+
+
 def delete_event(service, gcalendar: str, gevent, dry_run: bool = False) -> bool:
     """
     Removes the Google event in the Google calendar.
@@ -148,26 +208,19 @@ def delete_event(service, gcalendar: str, gevent, dry_run: bool = False) -> bool
     :return: True if successfully deleted
     :rtype: bool
     """
-    logger().info("deleting: %s" % str(gevent))
-    if dry_run:
+    try:
+        request = delete_request(service, gcalendar, gevent, dry_run=dry_run)
+        if request is not None:
+            request.execute()
         return True
-    else:
-        try:
-            (
-                service.events().delete(
-                    calendarId=gcalendar,
-                    eventId=gevent["id"],
-                ).execute()
-            )
-            return True
-        except:
-            logger().error("Failed to delete (cal=%s): %s" % (gcalendar, str(gevent)))
-            return False
+    except:
+        logger().error("Failed to delete (cal=%s): %s" % (gcalendar, str(gevent)))
+        return False
 
 
-def update_event(service, gcalendar: str, oevent, gevent, dry_run: bool = False) -> bool:
+def update_request(service, gcalendar: str, oevent, gevent, dry_run: bool = False):
     """
-    Updates the Outlook event in the Google calendar.
+    Creates the (unexecuted) request for updating the Google event with the Outlook event.
 
     :param service: the Google Calendar service instance to use
     :param gcalendar: the Google Calendar to use
@@ -175,60 +228,55 @@ def update_event(service, gcalendar: str, oevent, gevent, dry_run: bool = False)
     :param oevent: the Outlook event to update
     :type oevent: icalendar.Event
     :param gevent: the corresponding Google calendar event
-    :param dry_run: whether to perform a dry-run only and not change the Google Calendar at all
+    :param dry_run: whether to perform a dry-run only, i.e., only log the request body
     :type dry_run: bool
-    :return: True if successfully updated
-    :rtype: bool
+    :return: the request, None if dry-run
     """
     if gevent is None:
         logger().info("updating %s" % str(oevent))
     else:
         logger().info("updating %s with %s" % (str(gevent), str(oevent)))
-    body = {
-        "summary": event_field(oevent, EVENT_SUMMARY),
-        "iCalUID": event_field(oevent, EVENT_ID),
-        "reminders": {"useDefaults": True},
-    }
-    if event_field(oevent, EVENT_LOCATION) is not None:
-        body["location"] = event_field(oevent, EVENT_LOCATION)
-    if event_field(oevent, EVENT_STATUS) is not None:
-        body["status"] = event_field(oevent, EVENT_STATUS).lower()
-    if event_field(oevent, EVENT_DESCRIPTION) is not None:
-        body["description"] = event_field(oevent, EVENT_DESCRIPTION)
-    start = event_field(oevent, EVENT_START)
-    end = event_field(oevent, EVENT_END)
-    if (start is not None) and (end is not None):
-        if isinstance(start, datetime):
-            body["start"] = {"dateTime": start.isoformat(), "timeZone": str(start.tzinfo)}
-            body["end"] = {"dateTime": end.isoformat(), "timeZone": str(end.tzinfo)}
-        else:
-            body["start"] = {"date": start.strftime("%Y-%m-%d")}
-            body["end"] = {"date": end.strftime("%Y-%m-%d")}
-        logger().info("event: %s-%s: %s" % (str(start), str(end), event_field(oevent, EVENT_SUMMARY)))
-    if event_field(oevent, EVENT_RECURRENCE) is not None:
-        body["recurrence"] = ["RRULE:" + event_field(oevent, EVENT_RECURRENCE).to_ical().decode()]
-
+    body = event_body(oevent)
     if dry_run:
         logger().info("update body:\n%s" % (json.dumps(body, indent=2)))
-    else:
-        try:
-            event = (
-                service.events().update(
-                    calendarId=gcalendar,
-                    eventId=event_field(gevent, EVENT_ID),
-                    body=body,
-                ).execute()
-            )
+        return None
+    return service.events().update(
+        calendarId=gcalendar,
+        eventId=event_field(gevent, EVENT_ID),
+        body=body,
+    )
+
+
+def update_event(service, gcalendar: str, oevent, gevent, dry_run: bool = False) -> bool:
+    """
+    Updates the Outlook event in the Google calendar.
+
+    :param service: the Google Calendar service instance to use
+    :param gcalendar: the Google Calendar to use
+    :type gcalendar: str
+    :param oevent: the Outlook event to update
+    :type oevent: icalendar.Event
+    :param gevent: the corresponding Google calendar event
+    :param dry_run: whether to perform a dry-run only and not change the Google Calendar at all
+    :type dry_run: bool
+    :return: True if successfully updated
+    :rtype: bool
+    """
+    try:
+        request = update_request(service, gcalendar, oevent, gevent, dry_run=dry_run)
+        if request is not None:
+            event = request.execute()
             logger().info("event updated: %s" % str(event))
-            return True
-        except:
-            logger().error("Failed to update (cal=%s): %s" % (gcalendar, str(oevent)), exc_info=True)
-            return False
+        return True
+    except:
+        logger().error("Failed to update (cal=%s): %s" % (gcalendar, str(oevent)), exc_info=True)
+        return False
 
 
-def sync(service, gcalendar: str, actions: Dict[str, List], dry_run: bool = False) -> Dict[str, List[Any]]:
+def sync(service, gcalendar: str, actions: Dict[str, List], dry_run: bool = False,
+         batch_size: int = BATCH_SIZE) -> Dict[str, List[Any]]:
     """
-    Performs the sync.
+    Performs the sync. The requests are sent to Google Calendar in batches.
 
     :param service: the Google Calendar service instance to use
     :param gcalendar: the Google Calendar to use
@@ -237,6 +285,8 @@ def sync(service, gcalendar: str, actions: Dict[str, List], dry_run: bool = Fals
     :type actions: dict
     :param dry_run: whether to perform a dry-run only and not change the Google Calendar at all
     :type dry_run: bool
+    :param batch_size: the maximum number of requests to send per batch
+    :type batch_size: int
     :return: the dictionary with events per action that failed: action -> list of tuples; with last element in tuple the exception string
     :rtype: dict
     """
@@ -245,31 +295,62 @@ def sync(service, gcalendar: str, actions: Dict[str, List], dry_run: bool = Fals
         result[action] = []
     added = set()
 
+    # assemble requests: (action, tuple of events, request)
+    batch_requests = []
     for action in actions:
         if action == ACTION_ADD:
             for oevent in actions[action]:
                 uid = event_field(oevent, EVENT_ID)
                 if uid in added:
                     logger().info("already added, skipping: %s" % uid)
-                else:
-                    try:
-                        add_event(service, gcalendar, oevent, dry_run=dry_run)
-                        added.add(uid)
-                    except:
-                        result[action].append((oevent, traceback.format_exc()))
+                    continue
+                added.add(uid)
+                try:
+                    request = add_request(service, gcalendar, oevent, dry_run=dry_run)
+                    if request is not None:
+                        batch_requests.append((action, (oevent,), request))
+                except:
+                    result[action].append((oevent, traceback.format_exc()))
         elif action == ACTION_UPDATE:
             for oevent, gevent in actions[action]:
                 try:
-                    update_event(service, gcalendar, oevent, gevent, dry_run=dry_run)
+                    request = update_request(service, gcalendar, oevent, gevent, dry_run=dry_run)
+                    if request is not None:
+                        batch_requests.append((action, (oevent, gevent), request))
                 except:
                     result[action].append((oevent, gevent, traceback.format_exc()))
         elif action == ACTION_DELETE:
             for gevent in actions[action]:
                 try:
-                    delete_event(service, gcalendar, gevent, dry_run=dry_run)
+                    request = delete_request(service, gcalendar, gevent, dry_run=dry_run)
+                    if request is not None:
+                        batch_requests.append((action, (gevent,), request))
                 except:
                     result[action].append((gevent, traceback.format_exc()))
 
+    # send requests in batches
+    for i in range(0, len(batch_requests), batch_size):
+        chunk = batch_requests[i:i + batch_size]
+
+        def callback(request_id, response, exception):
+            action, events, _ = chunk[int(request_id)]
+            if exception is None:
+                logger().info("event %s: %s" % (action, str(response)))
+            else:
+                logger().error("Failed to %s (cal=%s): %s" % (action, gcalendar, str(events[0])))
+                result[action].append(events + (str(exception),))
+
+        batch = service.new_batch_http_request(callback=callback)
+        for n, (_, _, request) in enumerate(chunk):
+            batch.add(request, request_id=str(n))
+        try:
+            batch.execute()
+        except:
+            exc = traceback.format_exc()
+            logger().error("Failed to execute batch (cal=%s)" % gcalendar, exc_info=True)
+            for action, events, _ in chunk:
+                result[action].append(events + (exc,))
+
     for action in ACTIONS:
         if len(result[action]) == 0:
             del result[action]
@@ -1,13 +1,17 @@
 import argparse
 import logging
+import signal
+import threading
 import traceback
 
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Tuple, List, Any
 
 from wai.logging import init_logging, add_logging_level
-from itg.api.outlook import load_calendar
+from itg.api.outlook import load_calendar, calendar_digest
 from itg.api.outlook import filter_events as ofilter_events
-from itg.api.google import init_service
+from itg.api.google import init_service, is_auth_error
 from itg.api.google import filter_events as gfilter_events
 from itg.api.sync import compare, sync
 
@@ -31,10 +35,66 @@ def logger() -> logging.Logger:
     return _logger
 
 
+def load_google_events(google_credentials: str, google_calendar: str,
+                       google_id: str = None, google_summary: str = None,
+                       google_service=None) -> Tuple[Any, List]:
+    """
+    Retrieves the events from the Google calendar, initializing the service if necessary.
+    Re-initializes the service once if an authentication error occurs with the supplied service.
+
+    :param google_credentials: the credentials JSON file to use
+    :type google_credentials: str
+    :param google_calendar: the calendar ID
+    :type google_calendar: str
+    :param google_id: the regular expression that the event IDs must match, ignored if None
+    :type google_id: str
+    :param google_summary: the regular expression that the event summaries must match, ignored if None
+    :type google_summary: str
+    :param google_service: the service instance to re-use, initializes a new one if None
+    :return: the tuple of service and list of events
+    :rtype: tuple
+    """
+    if google_service is not None:
+        try:
+            google_events = gfilter_events(google_service, google_calendar, regexp_id=google_id, regexp_summary=google_summary)
+            return google_service, google_events
+        except Exception as e:
+            if not is_auth_error(e):
+                raise
+            logger().warning("Authentication failed, re-initializing Google Calendar service: %s" % str(e))
+
+    google_service = init_service(google_credentials)
+    google_events = gfilter_events(google_service, google_calendar, regexp_id=google_id, regexp_summary=google_summary)
+    return google_service, google_events
+
+
+def wait_for_next_poll(seconds: float) -> bool:
+    """
+    Waits the specified number of seconds. A SIGTERM received while waiting
+    (only when called from the main thread) ends the wait early; outside the
+    wait, SIGTERM keeps its previous behavior.
+
+    :param seconds: the number of seconds to wait
+    :type seconds: float
+    :return: True if SIGTERM was received while waiting
+    :rtype: bool
+    """
+    shutdown = threading.Event()
+    if threading.current_thread() is not threading.main_thread():
+        shutdown.wait(seconds)
+        return False
+
+    prev_handler = signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+    try:
+        return shutdown.wait(seconds)
+    finally:
+        signal.signal(signal.SIGTERM, prev_handler if (prev_handler is not None) else signal.SIG_DFL)
+
+
 def sync_events(ical_calendar: str, google_credentials: str, google_calendar: str,
                 ical_id: str = None, ical_summary: str = None, ical_output: str = None,
                 google_id: str = None, google_summary: str = None,
-                dry_run: bool = False, poll_interval: int = None):
+                dry_run: bool = False, poll_interval: int = None, max_poll_interval: int = None):
     """
     Syncs the events from the iCal/Outlook calendar with the Google one.
 
@@ -58,27 +118,79 @@ def sync_events(ical_calendar: str, google_credentials: str, google_calendar: st
     :type dry_run: bool
     :param poll_interval: the interval in seconds to poll the Outlook calendar, only once if None
     :type poll_interval: int
+    :param max_poll_interval: the maximum interval in seconds that the poll interval can grow to while the
+                              calendar doesn't change, uses fixed poll interval if None
+    :type max_poll_interval: int
     """
-    while True:
-        # outlook
-        ical_cal = load_calendar(ical_calendar, output_file=ical_output)
-        ical_events = ofilter_events(ical_cal, regexp_id=ical_id, regexp_summary=ical_summary)
-
-        # google
-        google_service = init_service(google_credentials)
-        google_events = gfilter_events(google_service, google_calendar, regexp_id=google_id, regexp_summary=google_summary)
-
-        comparison = compare(ical_events, google_events)
-        errors = sync(google_service, google_calendar, comparison, dry_run=dry_run)
-        num_errors = sum([len(errors[x]) for x in errors])
-        if num_errors > 0:
-            logger().warning("%d errors occurred!")
-
+    if (poll_interval is not None) and (poll_interval <= 0):
+        raise Exception("Poll interval must be greater than 0, provided: %d" % poll_interval)
+    if max_poll_interval is not None:
         if poll_interval is None:
-            break
-        else:
-            logger().info("Waiting %d seconds before next poll..." % poll_interval)
-            sleep(poll_interval)
+            raise Exception("Maximum poll interval requires a poll interval!")
+        if max_poll_interval < poll_interval:
+            raise Exception("Maximum poll interval must be at least the poll interval (%d), provided: %d" % (poll_interval, max_poll_interval))
+
+    current_interval = poll_interval
+    next_poll = monotonic()
+    google_service = None
+    last_ics_digest = None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        while True:
+            # retrieve outlook and google events concurrently
+            # (google events are only required up front if the last sync didn't succeed)
+            ical_future = executor.submit(load_calendar, ical_calendar, output_file=ical_output)
+            google_future = None
+            if last_ics_digest is None:
+                google_future = executor.submit(load_google_events, google_credentials, google_calendar,
+                                                google_id=google_id, google_summary=google_summary,
+                                                google_service=google_service)
+
+            # outlook
+            ical_cal = ical_future.result()
+            ical_digest = calendar_digest(ical_calendar)
+
+            if (ical_digest is not None) and (ical_digest == last_ics_digest):
+                logger().info("Outlook calendar unchanged, skipping sync")
+                comparison = dict()
+            else:
+                if google_future is None:
+                    google_future = executor.submit(load_google_events, google_credentials, google_calendar,
+                                                    google_id=google_id, google_summary=google_summary,
+                                                    google_service=google_service)
+                ical_events = ofilter_events(ical_cal, regexp_id=ical_id, regexp_summary=ical_summary)
+
+                # google
+                google_service, google_events = google_future.result()
+
+                comparison = compare(ical_events, google_events)
+                errors = sync(google_service, google_calendar, comparison, dry_run=dry_run)
+                num_errors = sum([len(errors[x]) for x in errors])
+                if num_errors > 0:
+                    logger().warning("%d errors occurred!" % num_errors)
+                    last_ics_digest = None
+                else:
+                    last_ics_digest = ical_digest
+
+            if poll_interval is None:
+                break
+            else:
+                # adjust interval: additive increase while nothing changes, multiplicative decrease on changes
+                if max_poll_interval is not None:
+                    if len(comparison) == 0:
+                        current_interval = min(current_interval + poll_interval, max_poll_interval)
+                    else:
+                        current_interval = max(current_interval // 2, poll_interval)
+
+                # wake up at fixed multiples of the interval, skipping any missed polls
+                now = monotonic()
+                next_poll += current_interval
+                while next_poll <= now:
+                    next_poll += current_interval
+                logger().info("Waiting %.1f seconds before next poll..." % (next_poll - now))
+                if wait_for_next_poll(next_poll - now):
+                    logger().info("Shutting down...")
+                    break
 
 
 def main():
@@ -96,6 +208,7 @@ def main():
     parser.add_argument('-S', '--google_summary', metavar="REGEXP", type=str, help='The regular expression that the event summary must match.', required=False, default=None)
     parser.add_argument('-n', '--dry_run', action="store_true", help='Whether to perform a dry-run instead, not changing Google calendar at all.')
     parser.add_argument('-p', '--poll_interval', metavar="SEC", type=int, help='The interval to poll the Outlook calendar in seconds.', required=False, default=None)
+    parser.add_argument('--max_poll_interval', metavar="SEC", type=int, help='The maximum interval in seconds that the poll interval increases to while the Outlook calendar does not change; uses fixed interval if not specified.', required=False, default=None)
     add_logging_level(parser)
     parsed = parser.parse_args()
 
@@ -104,7 +217,8 @@ def main():
                 ical_id=parsed.ical_id, ical_summary=parsed.ical_summary,
                 ical_output=parsed.ical_output,
                 google_id=parsed.google_id, google_summary=parsed.google_summary,
-                dry_run=parsed.dry_run, poll_interval=parsed.poll_interval)
+                dry_run=parsed.dry_run, poll_interval=parsed.poll_interval,
+                max_poll_interval=parsed.max_poll_interval)
 
 
 def sys_main() -> int: